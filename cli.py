@@ -13,6 +13,7 @@ import typer
 from cookcommit.commands.save import save_command
 from cookcommit.commands.commit import generate_commit_command
 from cookcommit.commands.pr import generate_pr_command
+from cookcommit.commands.config import config_app, settings_callback
 
 app = typer.Typer(
     name="cookcommit",
@@ -24,6 +25,10 @@ app = typer.Typer(
 app.command("save", help="Save git diff --cached to a text file")(save_command)
 app.command("commit", help="Generate commit message from staged changes")(generate_commit_command)
 app.command("pr", help="Generate PR message from staged changes")(generate_pr_command)
+app.add_typer(config_app, name="config")
+
+# Resolve settings (and --set overrides) before any command runs
+app.callback()(settings_callback)
 
 
 if __name__ == "__main__":
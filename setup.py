@@ -12,6 +12,7 @@ setup(
     install_requires=[
         "typer>=0.12.0",
         "google-genai>=1.0.0",
+        "tomli>=1.1.0; python_version < '3.11'",
     ],
     entry_points={
         "console_scripts": [
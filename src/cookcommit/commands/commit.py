@@ -2,12 +2,19 @@
 Generate commit command implementation.
 """
 
+import re
+import shlex
 import typer
-from typing import Optional
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from ..services.git_service import GitService
 from ..services.ai_service import AIService
 from ..utils.file_utils import save_to_file
+from ..utils.diff_utils import FileDiff, parse_diff
+from ..utils.scope_utils import load_scope_rules, partition_diff, join_file_diffs
+from ..utils.snapshot_utils import DiffSnapshot
+from ..config import SPLIT_DIR
 from ..utils.output_utils import (
     print_error, print_success, print_info, print_loader,
     print_result_box, print_next_steps, extract_first_line
@@ -17,34 +24,93 @@ from ..utils.output_utils import (
 def generate_commit_command(
     output_file: Optional[str] = typer.Option(None, "--output", "-o", help="Save commit message to file"),
     auto_commit: bool = typer.Option(False, "--commit", "-c", help="Automatically commit with generated message"),
+    split: bool = typer.Option(False, "--split", help="Suggest one commit per scope instead of a multi-scope message"),
+    from_snapshot: Optional[str] = typer.Option(None, "--from-snapshot", help="Read the diff from a snapshot saved with 'save --format snapshot'"),
 ) -> None:
     """
     Generate a commit message from git diff --cached using Gemini AI.
     """
-    # Check if we're in a git repository
-    if not GitService.is_git_repository():
-        print_error("Not in a git repository")
+    if split and auto_commit:
+        print_error("--split cannot be combined with --commit")
         raise typer.Exit(1)
 
-    # Check for staged changes
-    if not GitService.has_staged_changes():
-        print_info("No staged changes found")
-        print_info("Use 'git add <files>' to stage changes first")
-        return
+    if from_snapshot and auto_commit:
+        print_error("--from-snapshot cannot be combined with --commit")
+        raise typer.Exit(1)
 
-    # Get staged diff
-    diff_content, success = GitService.get_staged_diff()
+    snapshot = None
+    diff_content = ""
 
-    if not success:
-        print_error(diff_content)  # diff_content contains error message
-        raise typer.Exit(1)
+    if from_snapshot:
+        try:
+            snapshot = DiffSnapshot(from_snapshot)
+        except ValueError as e:
+            print_error(str(e))
+            raise typer.Exit(1)
+    else:
+        # Check if we're in a git repository
+        if not GitService.is_git_repository():
+            print_error("Not in a git repository")
+            raise typer.Exit(1)
+
+        # Check for staged changes
+        if not GitService.has_staged_changes():
+            print_info("No staged changes found")
+            print_info("Use 'git add <files>' to stage changes first")
+            return
 
+        # Get staged diff
+        diff_content, success = GitService.get_staged_diff()
+
+        if not success:
+            print_error(diff_content)  # diff_content contains error message
+            raise typer.Exit(1)
+
+    # Group the diff by monorepo scope, if scope rules are configured
     try:
-        print_loader("Generating commit message...")
+        rules = load_scope_rules()
+    except ValueError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+    if not rules:
+        partitions = {}
+    elif snapshot:
+        partitions = partition_diff(snapshot.files, rules)
+    else:
+        partitions = partition_diff(parse_diff(diff_content), rules)
 
-        # Generate commit message using AI
+    try:
         ai_service = AIService()
-        commit_message = ai_service.generate_commit_message(diff_content)
+
+        if len(partitions) > 1:
+            print_loader(f"Generating commit messages for {len(partitions)} scopes...")
+            if snapshot:
+                scope_diffs = {
+                    scope or "": '\n'.join(snapshot.read_file(f) for f in files)
+                    for scope, files in partitions.items()
+                }
+            else:
+                scope_diffs = {scope or "": join_file_diffs(files) for scope, files in partitions.items()}
+            scope_messages = ai_service.generate_scoped_commit_messages(scope_diffs)
+
+            if split:
+                scope_files = None if snapshot else {scope or "": files for scope, files in partitions.items()}
+                _show_split_suggestion(scope_messages, output_file, scope_files)
+                return
+
+            commit_message = ai_service.compose_multi_scope_commit_message(scope_messages)
+        else:
+            if split:
+                print_info("All staged changes belong to a single scope, generating one commit message")
+            print_loader("Generating commit message...")
+
+            # Generate commit message using AI
+            scope = next(iter(partitions), None)
+            if snapshot:
+                commit_message = ai_service.generate_commit_message_from_snapshot(snapshot, scope)
+            else:
+                commit_message = ai_service.generate_commit_message(diff_content, scope)
 
         # Display the generated commit message
         save_info = None
@@ -78,3 +144,61 @@ def generate_commit_command(
     except Exception as e:
         print_error(f"Error generating commit message: {e}")
         raise typer.Exit(1)
+    finally:
+        if snapshot:
+            snapshot.close()
+
+
+def _show_split_suggestion(
+    scope_messages: Dict[str, str],
+    output_file: Optional[str],
+    scope_files: Optional[Dict[str, List[FileDiff]]],
+) -> None:
+    """
+    Display one suggested commit per scope.
+
+    When scope_files is given, each scope's staged changes are written as a
+    binary-safe patch, so the split commits reproduce exactly what was staged
+    even for partially staged and binary files.
+    """
+    for scope, message in scope_messages.items():
+        print_result_box(f"Suggested Commit [{scope or 'unscoped'}]", message)
+
+    if output_file:
+        content = "\n\n".join(scope_messages.values())
+        if save_to_file(content, output_file):
+            print_info(f"Saved commit messages to: {output_file}")
+
+    if scope_files is None:
+        return
+
+    split_dir = Path(SPLIT_DIR)
+    try:
+        split_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print_error(f"Failed to write split patches: {e}")
+        return
+
+    # Every patch must be written before suggesting the reset, or the staged
+    # changes could not be restored from them
+    commit_steps = []
+    for i, (scope, files) in enumerate(scope_files.items(), 1):
+        label = scope or "unscoped"
+        name = f"{i}-" + re.sub(r'[^\w.-]', '_', label)
+        patch_file = str(split_dir / f"{name}.patch")
+        message_file = str(split_dir / f"{name}.msg")
+
+        paths = [path for f in files for path in (f.old_path, f.path) if path]
+        patch, success = GitService.get_staged_patch(paths)
+        if not success or not patch.strip():
+            print_error(f"Failed to get staged changes for scope '{label}': {patch}")
+            return
+        if not (save_to_file(patch, patch_file) and save_to_file(scope_messages[scope], message_file)):
+            print_error(f"Failed to write split patches to: {split_dir}")
+            return
+
+        commit_steps.append(
+            f"[{label}] git apply --cached {shlex.quote(patch_file)} && git commit -F {shlex.quote(message_file)}"
+        )
+
+    print_next_steps(["Unstage everything (working tree is kept): git reset -q"] + commit_steps)
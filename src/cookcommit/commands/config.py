@@ -0,0 +1,52 @@
+"""
+Config command implementation.
+"""
+
+import typer
+from dataclasses import fields
+from typing import List, Optional
+
+from ..settings import init_settings, get_settings, parse_overrides, user_config_path
+from ..config import REPO_CONFIG_FILE
+from ..utils.output_utils import print_error, print_info, print_result_box
+
+config_app = typer.Typer(help="Inspect runtime settings", add_completion=False)
+
+
+def settings_callback(
+    overrides: Optional[List[str]] = typer.Option(
+        None, "--set", "-s", help="Override a setting for this run, e.g. --set max_chunk_size=8000"
+    ),
+) -> None:
+    """
+    AI-powered git commit and PR message generator.
+    """
+    try:
+        init_settings(parse_overrides(overrides or []))
+    except ValueError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+
+@config_app.command("show")
+def show_config_command() -> None:
+    """
+    Show the resolved settings and where each value comes from.
+    """
+    settings = get_settings()
+
+    lines = []
+    for setting in fields(settings):
+        if setting.name == "sources":
+            continue
+        value = getattr(settings, setting.name)
+        if setting.name == "api_key":
+            if not value:
+                value = "(not set)"
+            else:
+                value = f"{value[:4]}****" if len(value) > 8 else "****"
+        lines.append(f"{setting.name:<18} = {value!s:<24} ({settings.sources[setting.name]})")
+
+    print_result_box("Settings", "\n".join(lines))
+    print_info(f"Config files: {user_config_path()}, {REPO_CONFIG_FILE}")
+    print_info("Environment: COOKCOMMIT_<NAME>, command line: --set NAME=VALUE")
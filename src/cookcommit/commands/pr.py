@@ -8,6 +8,7 @@ from typing import Optional
 from ..services.git_service import GitService
 from ..services.ai_service import AIService
 from ..utils.file_utils import save_to_file
+from ..utils.snapshot_utils import DiffSnapshot
 from ..utils.output_utils import (
     print_error, print_info, print_loader,
     print_result_box, print_next_steps
@@ -17,27 +18,38 @@ from ..utils.output_utils import (
 def generate_pr_command(
     output_file: Optional[str] = typer.Option(None, "--output", "-o", help="Save PR message to file"),
     title_only: bool = typer.Option(False, "--title-only", help="Generate only PR title"),
+    from_snapshot: Optional[str] = typer.Option(None, "--from-snapshot", help="Read the diff from a snapshot saved with 'save --format snapshot'"),
 ) -> None:
     """
     Generate a Pull Request message from git diff --cached using Gemini AI.
     """
-    # Check if we're in a git repository
-    if not GitService.is_git_repository():
-        print_error("Not in a git repository")
-        raise typer.Exit(1)
+    snapshot = None
+    diff_content = ""
 
-    # Check for staged changes
-    if not GitService.has_staged_changes():
-        print_info("No staged changes found")
-        print_info("Use 'git add <files>' to stage changes first")
-        return
+    if from_snapshot:
+        try:
+            snapshot = DiffSnapshot(from_snapshot)
+        except ValueError as e:
+            print_error(str(e))
+            raise typer.Exit(1)
+    else:
+        # Check if we're in a git repository
+        if not GitService.is_git_repository():
+            print_error("Not in a git repository")
+            raise typer.Exit(1)
 
-    # Get staged diff
-    diff_content, success = GitService.get_staged_diff()
+        # Check for staged changes
+        if not GitService.has_staged_changes():
+            print_info("No staged changes found")
+            print_info("Use 'git add <files>' to stage changes first")
+            return
 
-    if not success:
-        print_error(diff_content)  # diff_content contains error message
-        raise typer.Exit(1)
+        # Get staged diff
+        diff_content, success = GitService.get_staged_diff()
+
+        if not success:
+            print_error(diff_content)  # diff_content contains error message
+            raise typer.Exit(1)
 
     try:
         if title_only:
@@ -47,7 +59,10 @@ def generate_pr_command(
 
         # Generate PR message using AI
         ai_service = AIService()
-        pr_message = ai_service.generate_pr_message(diff_content, title_only)
+        if snapshot:
+            pr_message = ai_service.generate_pr_message_from_snapshot(snapshot, title_only)
+        else:
+            pr_message = ai_service.generate_pr_message(diff_content, title_only)
 
         # Display the generated PR message
         title = "Generated PR Title" if title_only else "Generated PR Message"
@@ -76,3 +91,6 @@ def generate_pr_command(
     except Exception as e:
         print_error(f"Error generating PR message: {e}")
         raise typer.Exit(1)
+    finally:
+        if snapshot:
+            snapshot.close()
@@ -7,16 +7,30 @@ from typing import Optional
 
 from ..services.git_service import GitService
 from ..utils.file_utils import save_to_file
+from ..utils.snapshot_utils import write_snapshot
 from ..utils.output_utils import print_error, print_success, print_info
-from ..config import DEFAULT_DIFF_FILE
+from ..config import DEFAULT_DIFF_FILE, DEFAULT_SNAPSHOT_FILE
+
+SAVE_FORMATS = ("text", "snapshot")
 
 
 def save_command(
-    output: str = typer.Option(DEFAULT_DIFF_FILE, "--output", "-o", help="Output file name"),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o",
+        help=f"Output file name [default: {DEFAULT_DIFF_FILE}, or {DEFAULT_SNAPSHOT_FILE} for snapshots]"
+    ),
+    save_format: str = typer.Option("text", "--format", "-f", help="Output format: text or snapshot"),
 ) -> None:
     """
-    Save git diff --cached output to a text file.
+    Save git diff --cached output to a text file or a compressed snapshot.
     """
+    if save_format not in SAVE_FORMATS:
+        print_error(f"Unknown format: {save_format} (expected one of: {', '.join(SAVE_FORMATS)})")
+        raise typer.Exit(1)
+
+    if output is None:
+        output = DEFAULT_SNAPSHOT_FILE if save_format == "snapshot" else DEFAULT_DIFF_FILE
+
     # Check if we're in a git repository
     if not GitService.is_git_repository():
         print_error("Not in a git repository")
@@ -35,7 +49,12 @@ def save_command(
         return
 
     # Save to file
-    if save_to_file(diff_content, output):
+    if save_format == "snapshot":
+        saved = write_snapshot(diff_content, output)
+    else:
+        saved = save_to_file(diff_content, output)
+
+    if saved:
         print_success(f"Saved git diff --cached to: {output}")
     else:
         print_error(f"Failed to save to file: {output}")
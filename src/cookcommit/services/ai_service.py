@@ -2,10 +2,17 @@
 AI service for generating commit and PR messages.
 """
 
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 from google import genai
-from ..config import API_KEY, DEFAULT_MODEL, LITE_MODEL
+from google.genai import errors, types
+from ..settings import get_settings
 from ..utils.text_utils import chunk_text
+from ..utils.cache_utils import make_cache_key, load_cached, store_cached
+from ..utils.diff_utils import parse_diff, build_change_index, index_covers_changes, truncate_change_index
+from ..utils.snapshot_utils import DiffSnapshot
 
 
 class AIService:
@@ -13,31 +20,41 @@ class AIService:
 
     def __init__(self):
         """Initialize the AI service with Gemini client."""
-        self.client = genai.Client(api_key=API_KEY)
+        self.settings = get_settings()
+        if not self.settings.api_key:
+            raise ValueError(
+                "No Gemini API key configured. Set COOKCOMMIT_API_KEY, GEMINI_API_KEY or "
+                "GOOGLE_API_KEY, or api_key in the user config file (see 'config show')"
+            )
+        # Caps concurrent model requests across all worker pools of this service
+        self._request_slots = threading.BoundedSemaphore(self.settings.max_workers)
+        self.client = genai.Client(
+            api_key=self.settings.api_key,
+            http_options=types.HttpOptions(timeout=int(self.settings.request_timeout * 1000))
+        )
 
-    def generate_commit_message(self, diff_content: str) -> str:
+    def generate_commit_message(self, diff_content: str, scope: Optional[str] = None) -> str:
         """
         Generate a commit message from git diff content.
 
         Args:
             diff_content: Git diff content
+            scope: Conventional commit scope to use, if known
 
         Returns:
             Generated commit message
         """
-        chunks = chunk_text(diff_content)
+        chunks = chunk_text(diff_content, self.settings.max_chunk_size)
 
         if len(chunks) == 1:
             prompt = self._create_single_chunk_commit_prompt(chunks[0])
         else:
-            prompt = self._create_multi_chunk_commit_prompt(chunks)
+            prompt = self._create_multi_chunk_commit_prompt(self._describe_diff(diff_content, chunks))
 
-        response = self.client.models.generate_content(
-            model=DEFAULT_MODEL,
-            contents=prompt
-        )
+        if scope:
+            prompt += f'Use "{scope}" as the scope of the commit message.\n'
 
-        return response.text.strip()
+        return self._generate(self.settings.default_model, prompt)
 
     def generate_pr_message(self, diff_content: str, title_only: bool = False) -> str:
         """
@@ -50,19 +67,145 @@ class AIService:
         Returns:
             Generated PR message or title
         """
-        chunks = chunk_text(diff_content)
+        chunks = chunk_text(diff_content, self.settings.max_chunk_size)
 
         if len(chunks) == 1:
             prompt = self._create_single_chunk_pr_prompt(chunks[0], title_only)
         else:
-            prompt = self._create_multi_chunk_pr_prompt(chunks, title_only)
+            prompt = self._create_multi_chunk_pr_prompt(self._describe_diff(diff_content, chunks), title_only)
+
+        return self._generate(self.settings.default_model, prompt)
+
+    def generate_commit_message_from_snapshot(self, snapshot: DiffSnapshot, scope: Optional[str] = None) -> str:
+        """
+        Generate a commit message from a diff snapshot.
+
+        Uses the snapshot's pre-computed chunks and change index, and only
+        decompresses chunks that end up in a prompt.
+
+        Args:
+            snapshot: Diff snapshot
+            scope: Conventional commit scope to use, if known
+
+        Returns:
+            Generated commit message
+        """
+        if snapshot.chunk_count == 1:
+            prompt = self._create_single_chunk_commit_prompt(snapshot.read_chunk(0))
+        else:
+            prompt = self._create_multi_chunk_commit_prompt(self._describe_snapshot(snapshot))
+
+        if scope:
+            prompt += f'Use "{scope}" as the scope of the commit message.\n'
+
+        return self._generate(self.settings.default_model, prompt)
+
+    def generate_pr_message_from_snapshot(self, snapshot: DiffSnapshot, title_only: bool = False) -> str:
+        """
+        Generate a PR message from a diff snapshot.
+
+        Args:
+            snapshot: Diff snapshot
+            title_only: Generate only PR title if True
+
+        Returns:
+            Generated PR message or title
+        """
+        if snapshot.chunk_count == 1:
+            prompt = self._create_single_chunk_pr_prompt(snapshot.read_chunk(0), title_only)
+        else:
+            prompt = self._create_multi_chunk_pr_prompt(self._describe_snapshot(snapshot), title_only)
+
+        return self._generate(self.settings.default_model, prompt)
+
+    def generate_scoped_commit_messages(self, scope_diffs: Dict[str, str]) -> Dict[str, str]:
+        """
+        Generate one commit message per scope in parallel.
+
+        Results are cached per scope, so only scopes whose diff changed
+        since the last run are sent to the model.
+
+        Args:
+            scope_diffs: Mapping of scope to its git diff content
+
+        Returns:
+            Mapping of scope to generated commit message, in input order
+        """
+        messages: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+
+        for scope, diff_content in scope_diffs.items():
+            key = make_cache_key(
+                "commit", self.settings.default_model, self.settings.lite_model,
+                str(self.settings.max_chunk_size), scope, diff_content,
+            )
+            cached = load_cached(key)
+            if cached is not None:
+                messages[scope] = cached
+            else:
+                pending[scope] = key
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.settings.max_workers, len(pending))) as executor:
+                futures = {
+                    scope: executor.submit(self.generate_commit_message, scope_diffs[scope], scope)
+                    for scope in pending
+                }
+                for scope, future in futures.items():
+                    messages[scope] = future.result()
+                    store_cached(pending[scope], messages[scope])
+
+        return {scope: messages[scope] for scope in scope_diffs}
+
+    def compose_multi_scope_commit_message(self, scope_messages: Dict[str, str]) -> str:
+        """
+        Combine per-scope commit messages into a single commit message.
+
+        Args:
+            scope_messages: Mapping of scope to its commit message
 
-        response = self.client.models.generate_content(
-            model=DEFAULT_MODEL,
-            contents=prompt
+        Returns:
+            Combined commit message
+        """
+        key = make_cache_key(
+            "compose", self.settings.default_model, self.settings.lite_model,
+            str(self.settings.max_chunk_size),
+            *(f"{scope}\n{message}" for scope, message in scope_messages.items()),
         )
+        cached = load_cached(key)
+        if cached is not None:
+            return cached
 
-        return response.text.strip()
+        prompt = self._create_multi_scope_commit_prompt(scope_messages)
+        message = self._generate(self.settings.default_model, prompt)
+        store_cached(key, message)
+        return message
+
+    def _generate(self, model: str, prompt: str) -> str:
+        """
+        Send a prompt to the model, retrying rate limits and server errors
+        with exponential backoff. At most max_workers requests run at once.
+
+        Args:
+            model: Model name
+            prompt: Prompt text
+
+        Returns:
+            Generated text
+        """
+        for attempt in range(self.settings.max_retries + 1):
+            try:
+                with self._request_slots:
+                    response = self.client.models.generate_content(
+                        model=model,
+                        contents=prompt
+                    )
+                return response.text.strip()
+            except errors.APIError as e:
+                retryable = e.code == 429 or (e.code or 0) >= 500
+                if not retryable or attempt == self.settings.max_retries:
+                    raise
+                time.sleep(self.settings.retry_backoff * (2 ** attempt))
 
     def _summarize_chunk(self, chunk: str) -> str:
         """Summarize a single diff chunk."""
@@ -74,11 +217,45 @@ Summarize the changes in this git diff chunk. Be concise and focus on what was m
 Provide a brief summary of the changes:
 """
 
-        response = self.client.models.generate_content(
-            model=LITE_MODEL,
-            contents=summary_prompt
-        )
-        return response.text.strip()
+        return self._generate(self.settings.lite_model, summary_prompt)
+
+    def _describe_diff(self, diff_content: str, chunks: List[str]) -> str:
+        """Describe a multi-chunk diff for the final prompt."""
+        files = parse_diff(diff_content)
+        return self._describe_changes(build_change_index(files), index_covers_changes(files), lambda: chunks)
+
+    def _describe_snapshot(self, snapshot: DiffSnapshot) -> str:
+        """Describe a multi-chunk snapshot for the final prompt."""
+        return self._describe_changes(snapshot.change_index, snapshot.index_covers, snapshot.read_chunks)
+
+    def _describe_changes(self, change_index: str, index_covers: bool, load_chunks: Callable[[], List[str]]) -> str:
+        """
+        Build the change overview used in multi-chunk prompts.
+
+        The symbol-level change index is always included. Per-chunk
+        summaries are only requested when the index does not cover every
+        changed file or is too large to stand in for the diff; the index
+        is then truncated to the chunk budget.
+
+        Args:
+            change_index: Symbol-level change index
+            index_covers: Whether the index covers every changed file
+            load_chunks: Returns the diff chunks, called only if summaries are needed
+
+        Returns:
+            Change overview text
+        """
+        if index_covers and len(change_index) <= self.settings.max_chunk_size:
+            return f"Changed files and symbols:\n{change_index}"
+
+        change_index = truncate_change_index(change_index, self.settings.max_chunk_size)
+        overview = f"Changed files and symbols:\n{change_index}"
+
+        chunks = load_chunks()
+        with ThreadPoolExecutor(max_workers=min(self.settings.max_workers, len(chunks))) as executor:
+            chunk_summaries = list(executor.map(self._summarize_chunk, chunks))
+        summaries = '\n'.join(f"Chunk {i+1}: {summary}" for i, summary in enumerate(chunk_summaries))
+        return f"{overview}\n\nChange summaries:\n{summaries}"
 
     def _create_single_chunk_commit_prompt(self, chunk: str) -> str:
         """Create prompt for single chunk commit message."""
@@ -98,16 +275,10 @@ Git diff:
 Generate only the commit message, nothing else.
 """
 
-    def _create_multi_chunk_commit_prompt(self, chunks: List[str]) -> str:
+    def _create_multi_chunk_commit_prompt(self, change_overview: str) -> str:
         """Create prompt for multi-chunk commit message."""
-        # Summarize each chunk first
-        chunk_summaries = []
-        for chunk in chunks:
-            summary = self._summarize_chunk(chunk)
-            chunk_summaries.append(summary)
-
         return f"""
-Based on these summaries of git diff chunks, generate a concise, informative commit message.
+Based on this overview of the git diff, generate a concise, informative commit message.
 
 Rules for the commit message:
 1. Use conventional commit format: type(scope): description
@@ -116,8 +287,26 @@ Rules for the commit message:
 4. Be specific about what changed
 5. Focus on the "why" and "what", not the "how"
 
-Change summaries:
-{chr(10).join(f"Chunk {i+1}: {summary}" for i, summary in enumerate(chunk_summaries))}
+{change_overview}
+
+Generate only the commit message, nothing else.
+"""
+
+    def _create_multi_scope_commit_prompt(self, scope_messages: Dict[str, str]) -> str:
+        """Create prompt for combining per-scope commit messages."""
+        return f"""
+These commit messages each describe the staged changes in one package of a monorepo.
+Combine them into a single commit message.
+
+Rules for the commit message:
+1. Use conventional commit format: type(scope1,scope2): description
+2. Types: feat, fix, docs, style, refactor, test, chore
+3. Keep the first line under 50 characters
+4. In the body, add one bullet per scope summarizing its changes
+5. Focus on the "why" and "what", not the "how"
+
+Per-scope commit messages:
+{chr(10).join(f"[{scope}]{chr(10)}{message}{chr(10)}" for scope, message in scope_messages.items())}
 
 Generate only the commit message, nothing else.
 """
@@ -162,17 +351,11 @@ Git diff:
 Generate a complete PR message with title and description.
 """
 
-    def _create_multi_chunk_pr_prompt(self, chunks: List[str], title_only: bool) -> str:
+    def _create_multi_chunk_pr_prompt(self, change_overview: str, title_only: bool) -> str:
         """Create prompt for multi-chunk PR message."""
-        # Summarize each chunk first
-        chunk_summaries = []
-        for chunk in chunks:
-            summary = self._summarize_chunk(chunk)
-            chunk_summaries.append(summary)
-
         if title_only:
             return f"""
-Based on these summaries of git diff chunks, generate a concise Pull Request title.
+Based on this overview of the git diff, generate a concise Pull Request title.
 
 Rules for the PR title:
 1. Keep it under 72 characters
@@ -181,14 +364,13 @@ Rules for the PR title:
 4. Be specific about what changed
 5. Focus on the main feature/change
 
-Change summaries:
-{chr(10).join(f"Chunk {i+1}: {summary}" for i, summary in enumerate(chunk_summaries))}
+{change_overview}
 
 Generate only the PR title, nothing else.
 """
         else:
             return f"""
-Based on these summaries of git diff chunks, generate a comprehensive Pull Request message.
+Based on this overview of the git diff, generate a comprehensive Pull Request message.
 
 Format the PR message as follows:
 1. Title: Use conventional commit format (type(scope): description) - keep under 72 characters
@@ -202,8 +384,7 @@ Rules:
 - Use markdown formatting
 - Include relevant details for reviewers
 
-Change summaries:
-{chr(10).join(f"Chunk {i+1}: {summary}" for i, summary in enumerate(chunk_summaries))}
+{change_overview}
 
 Generate a complete PR message with title and description.
 """
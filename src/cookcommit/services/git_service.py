@@ -4,7 +4,7 @@ Git operations service.
 
 import subprocess
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple
 
 
 class GitService:
@@ -36,6 +36,31 @@ class GitService:
         except FileNotFoundError:
             return "Git not found. Please install git.", False
 
+    @staticmethod
+    def get_staged_patch(paths: List[str]) -> Tuple[str, bool]:
+        """
+        Get staged changes to the given paths as a patch that git apply can
+        replay, including binary files.
+
+        Args:
+            paths: Repository-relative file paths
+
+        Returns:
+            Tuple of (patch_content, success)
+        """
+        try:
+            result = subprocess.run(
+                ['git', '--literal-pathspecs', 'diff', '--cached', '--binary', '--', *paths],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            return result.stdout, True
+        except subprocess.CalledProcessError as e:
+            return f"Git command failed: {e}", False
+        except FileNotFoundError:
+            return "Git not found. Please install git.", False
+
     @staticmethod
     def has_staged_changes() -> bool:
         """Check if there are any staged changes."""
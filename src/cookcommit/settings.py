@@ -0,0 +1,210 @@
+"""
+Layered runtime settings for CookCommit CLI.
+
+Settings are resolved once per process. Later layers override earlier ones:
+
+1. Built-in defaults from config.py
+2. User config file ($XDG_CONFIG_HOME/cookcommit/config.toml)
+3. Repository config file (.cookcommit.toml)
+4. COOKCOMMIT_<NAME> environment variables
+5. --set NAME=VALUE command line flags
+
+Config files hold settings as top-level keys, e.g. ``max_chunk_size = 8000``.
+The API key may not be set in the repository config file, which is usually
+committed; GOOGLE_API_KEY and GEMINI_API_KEY are honored as fallbacks for
+COOKCOMMIT_API_KEY.
+"""
+
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import config
+from .utils.file_utils import load_toml_file
+
+ENV_PREFIX = "COOKCOMMIT_"
+
+# Tables in config files that are not settings (see utils/scope_utils.py)
+_OTHER_TABLES = {"scopes"}
+
+# Settings that must not come from the repository config file
+_SECRET_SETTINGS = {"api_key"}
+
+# Standard Gemini API key variables, in increasing priority, below COOKCOMMIT_API_KEY
+_API_KEY_ENV_FALLBACKS = ("GEMINI_API_KEY", "GOOGLE_API_KEY")
+
+_TYPE_NAMES = {str: "a string", int: "an integer", float: "a number"}
+
+# name -> (type, validity check, description of valid values)
+_SPECS: Dict[str, Tuple[type, Callable[[Any], bool], str]] = {
+    "api_key": (str, bool, "a non-empty string"),
+    "default_model": (str, bool, "a non-empty string"),
+    "lite_model": (str, bool, "a non-empty string"),
+    "request_timeout": (float, lambda v: v > 0, "greater than 0"),
+    "max_retries": (int, lambda v: v >= 0, "0 or greater"),
+    "retry_backoff": (float, lambda v: v >= 0, "0 or greater"),
+    "max_chunk_size": (int, lambda v: v >= 100, "100 or greater"),
+    "max_workers": (int, lambda v: v >= 1, "1 or greater"),
+    "cache_max_entries": (int, lambda v: v >= 0, "0 or greater"),
+    "cache_ttl": (int, lambda v: v >= 0, "0 or greater"),
+}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Resolved runtime settings."""
+
+    api_key: Optional[str] = None
+    default_model: str = config.DEFAULT_MODEL
+    lite_model: str = config.LITE_MODEL
+    request_timeout: float = config.REQUEST_TIMEOUT
+    max_retries: int = config.MAX_RETRIES
+    retry_backoff: float = config.RETRY_BACKOFF
+    max_chunk_size: int = config.MAX_CHUNK_SIZE
+    max_workers: int = config.MAX_WORKERS
+    cache_max_entries: int = config.CACHE_MAX_ENTRIES
+    cache_ttl: int = config.CACHE_TTL
+    sources: Dict[str, str] = field(default_factory=dict, compare=False)
+
+
+def user_config_path() -> Path:
+    """Get the path of the user config file."""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    return Path(config_home) / config.USER_CONFIG_FILE
+
+
+def parse_overrides(items: List[str]) -> Dict[str, str]:
+    """
+    Parse NAME=VALUE command line overrides.
+
+    Args:
+        items: Override strings
+
+    Returns:
+        Mapping of setting name to raw value
+
+    Raises:
+        ValueError: If an item is not of the form NAME=VALUE
+    """
+    overrides = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid override '{item}', expected NAME=VALUE")
+        overrides[name.strip()] = value.strip()
+    return overrides
+
+
+def _coerce(name: str, value: Any, source: str) -> Any:
+    """Convert and validate a single setting value."""
+    if name not in _SPECS:
+        raise ValueError(f"Unknown setting '{name}' in {source}")
+    kind, check, valid = _SPECS[name]
+
+    if isinstance(value, str) and kind is not str:
+        try:
+            value = kind(value)
+        except ValueError:
+            raise ValueError(f"Setting '{name}' in {source} must be {_TYPE_NAMES[kind]}, got '{value}'")
+    elif kind is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise ValueError(f"Setting '{name}' in {source} must be {_TYPE_NAMES[kind]}, got {value!r}")
+    if kind is float and not math.isfinite(value):
+        raise ValueError(f"Setting '{name}' in {source} must be a finite number, got {value!r}")
+    if not check(value):
+        raise ValueError(f"Setting '{name}' in {source} must be {valid}, got {value!r}")
+    return value
+
+
+def _file_layer(path: Path, allow_secrets: bool = True) -> Dict[str, Any]:
+    """Read the settings from a config file."""
+    data = load_toml_file(str(path))
+    settings = {name: value for name, value in data.items() if name not in _OTHER_TABLES}
+
+    secrets = sorted(_SECRET_SETTINGS & settings.keys())
+    if secrets and not allow_secrets:
+        raise ValueError(
+            f"Setting '{secrets[0]}' is not allowed in {path}; "
+            f"set it in {user_config_path()} or with {ENV_PREFIX}{secrets[0].upper()}"
+        )
+    return settings
+
+
+def _env_layer(environ: Dict[str, str]) -> Dict[str, str]:
+    """Read the settings from environment variables."""
+    settings = {}
+    for env_var in _API_KEY_ENV_FALLBACKS:
+        if environ.get(env_var):
+            settings["api_key"] = environ[env_var]
+
+    for name in _SPECS:
+        if ENV_PREFIX + name.upper() in environ:
+            settings[name] = environ[ENV_PREFIX + name.upper()]
+    return settings
+
+
+def load_settings(
+    cli_overrides: Optional[Dict[str, str]] = None,
+    environ: Optional[Dict[str, str]] = None,
+) -> Settings:
+    """
+    Resolve settings from all layers.
+
+    Args:
+        cli_overrides: Settings given on the command line
+        environ: Environment variables, defaults to os.environ
+
+    Returns:
+        Validated settings
+
+    Raises:
+        ValueError: If a config file is invalid or a setting is unknown or invalid
+    """
+    user_path = user_config_path()
+    layers = [
+        (str(user_path), _file_layer(user_path)),
+        (config.REPO_CONFIG_FILE, _file_layer(Path(config.REPO_CONFIG_FILE), allow_secrets=False)),
+        ("environment", _env_layer(os.environ if environ is None else environ)),
+        ("command line", cli_overrides or {}),
+    ]
+
+    values: Dict[str, Any] = {}
+    sources = {name: "default" for name in _SPECS}
+    for source, layer in layers:
+        for name, value in layer.items():
+            values[name] = _coerce(name, value, source)
+            sources[name] = source
+
+    return Settings(sources=sources, **values)
+
+
+_settings: Optional[Settings] = None
+
+
+def init_settings(cli_overrides: Optional[Dict[str, str]] = None) -> Settings:
+    """
+    Resolve settings and cache them for the rest of the process.
+
+    Args:
+        cli_overrides: Settings given on the command line
+
+    Returns:
+        Validated settings
+
+    Raises:
+        ValueError: If a config file is invalid or a setting is unknown or invalid
+    """
+    global _settings
+    _settings = load_settings(cli_overrides)
+    return _settings
+
+
+def get_settings() -> Settings:
+    """Get the cached settings, resolving them on first use."""
+    if _settings is None:
+        return init_settings()
+    return _settings
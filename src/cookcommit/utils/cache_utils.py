@@ -0,0 +1,89 @@
+"""
+Message cache utilities.
+"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..config import CACHE_DIR
+from ..settings import get_settings
+from ..services.git_service import GitService
+from .file_utils import save_to_file, read_from_file
+
+
+def make_cache_key(*parts: str) -> str:
+    """
+    Build a cache key from the inputs that determine a generated message.
+
+    Args:
+        parts: Strings such as the message kind, model and diff content
+
+    Returns:
+        Hex digest identifying the inputs
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _is_expired(path: Path) -> bool:
+    """Check whether a cache entry is older than the cache_ttl setting."""
+    ttl = get_settings().cache_ttl
+    try:
+        return ttl > 0 and time.time() - path.stat().st_mtime > ttl
+    except OSError:
+        return True
+
+
+def load_cached(key: str) -> Optional[str]:
+    """
+    Load a cached message.
+
+    Args:
+        key: Cache key from make_cache_key
+
+    Returns:
+        Cached message or None if not cached, expired or caching is disabled
+    """
+    if get_settings().cache_max_entries == 0:
+        return None
+    path = Path(CACHE_DIR) / key
+    if _is_expired(path):
+        return None
+    return read_from_file(str(path))
+
+
+def store_cached(key: str, content: str) -> bool:
+    """
+    Store a message in the cache, evicting the oldest entries beyond the
+    cache_max_entries setting.
+
+    Args:
+        key: Cache key from make_cache_key
+        content: Message to cache
+
+    Returns:
+        True if successful, False otherwise
+    """
+    max_entries = get_settings().cache_max_entries
+    # The cache lives inside .git; never create it outside a repository
+    if max_entries == 0 or not GitService.is_git_repository():
+        return False
+    try:
+        Path(CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    except Exception:
+        return False
+    if not save_to_file(content, str(Path(CACHE_DIR) / key)):
+        return False
+
+    try:
+        entries = sorted(Path(CACHE_DIR).iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[max_entries:]:
+            stale.unlink()
+    except OSError:
+        pass
+    return True
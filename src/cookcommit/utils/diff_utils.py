@@ -0,0 +1,414 @@
+"""
+Diff parsing and symbol extraction utilities.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional, Pattern, Tuple
+
+
+@dataclass
+class FileDiff:
+    """A single file's section of a unified git diff."""
+
+    path: str
+    old_path: Optional[str] = None
+    status: str = "M"
+    binary: bool = False
+    additions: int = 0
+    deletions: int = 0
+    old_blob: Optional[str] = None
+    new_blob: Optional[str] = None
+    offset: int = 0
+    hunk_offsets: List[int] = field(default_factory=list)
+    hunk_headers: List[str] = field(default_factory=list)
+    added_lines: List[str] = field(default_factory=list)
+    removed_lines: List[str] = field(default_factory=list)
+    text: str = ""
+
+
+# Symbol patterns per language; each pattern captures (kind, name)
+_PYTHON_PATTERNS = [
+    re.compile(r"^\s*(?:async\s+)?(def)\s+(\w+)"),
+    re.compile(r"^\s*(class)\s+(\w+)"),
+]
+_JS_PATTERNS = [
+    re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?(function)\*?\s+(\w+)"),
+    re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?(class|interface|enum|type)\s+(\w+)"),
+    re.compile(r"^\s*(?:export\s+)?(const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>|\w+\s*=>)"),
+]
+_GO_PATTERNS = [
+    re.compile(r"^\s*(func)\s+(?:\([^)]*\)\s*)?(\w+)"),
+    re.compile(r"^\s*(type)\s+(\w+)\s+(?:struct|interface)"),
+]
+_RUST_PATTERNS = [
+    re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(fn)\s+(\w+)"),
+    re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?(struct|enum|trait|mod)\s+(\w+)"),
+]
+_C_FAMILY_PATTERNS = [
+    re.compile(r"^\s*(?:(?:public|private|protected|internal|static|final|abstract|sealed|partial)\s+)*(class|interface|enum|struct|record)\s+(\w+)"),
+    re.compile(r"^\s*(?:[\w:<>\[\],*&]+\s+)+[*&]?(\w+)\s*\([^;]*$"),
+]
+_RUBY_PATTERNS = [
+    re.compile(r"^\s*(def)\s+(?:self\.)?(\w+[?!=]?)"),
+    re.compile(r"^\s*(class|module)\s+([\w:]+)"),
+]
+_YAML_PATTERNS = [re.compile(r"^(\s*)([\w.-]+)\s*:")]
+_TOML_PATTERNS = [
+    re.compile(r"^\s*\[\[?([^\]]+)\]\]?"),
+    re.compile(r"^\s*([\w.-]+)\s*="),
+]
+_JSON_PATTERNS = [re.compile(r'^\s*"([^"]+)"\s*:')]
+
+_LANGUAGE_BY_SUFFIX = {
+    ".py": "python", ".pyi": "python",
+    ".js": "js", ".jsx": "js", ".mjs": "js", ".cjs": "js",
+    ".ts": "js", ".tsx": "js", ".vue": "js", ".svelte": "js",
+    ".go": "go",
+    ".rs": "rust",
+    ".c": "c", ".h": "c", ".cc": "c", ".cpp": "c", ".hpp": "c",
+    ".java": "c", ".kt": "c", ".cs": "c", ".swift": "c", ".scala": "c",
+    ".rb": "ruby",
+    ".yml": "yaml", ".yaml": "yaml",
+    ".toml": "toml", ".ini": "toml", ".cfg": "toml", ".env": "toml",
+    ".json": "json",
+}
+
+_CODE_PATTERNS: Dict[str, List[Pattern]] = {
+    "python": _PYTHON_PATTERNS,
+    "js": _JS_PATTERNS,
+    "go": _GO_PATTERNS,
+    "rust": _RUST_PATTERNS,
+    "c": _C_FAMILY_PATTERNS,
+    "ruby": _RUBY_PATTERNS,
+}
+
+_C_KEYWORDS = {"if", "for", "while", "switch", "return", "catch", "sizeof", "else", "new"}
+
+_DIFF_HEADER_PREFIX = "diff --git "
+_UNQUOTED_PATHS = re.compile(r"^a/(.*) b/(.*)$")
+_C_ESCAPES = {
+    'a': b'\a', 'b': b'\b', 't': b'\t', 'n': b'\n', 'v': b'\v', 'f': b'\f', 'r': b'\r',
+    '"': b'"', '\\': b'\\',
+}
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@ ?(.*)$")
+_INDEX_LINE = re.compile(r"^index ([0-9a-f]+)\.\.([0-9a-f]+)")
+
+# Maximum symbols listed per file in the change index
+MAX_SYMBOLS_PER_FILE = 12
+
+# Changed lines quoted per file in the change index, and their maximum length
+MAX_EXCERPT_LINES_PER_FILE = 4
+MAX_EXCERPT_LINE_LENGTH = 100
+
+# A file with symbols counts as described by the index when it changes at
+# most this many lines per symbol
+MAX_COVERED_LINES_PER_SYMBOL = 20
+
+_EXCERPT_INDENT = "    "
+_ENTRY_STATS = re.compile(r"^(.* \(\+\d+ -\d+\)): .*$")
+
+
+def _unquote_path(path: str) -> str:
+    """Decode a path that git wrote in C-quoted form (e.g. non-ASCII names)."""
+    if not (len(path) >= 2 and path.startswith('"') and path.endswith('"')):
+        return path
+
+    raw = bytearray()
+    i, body = 0, path[1:-1]
+    while i < len(body):
+        char = body[i]
+        if char != '\\' or i + 1 == len(body):
+            raw += char.encode('utf-8')
+            i += 1
+        elif body[i + 1] in _C_ESCAPES:
+            raw += _C_ESCAPES[body[i + 1]]
+            i += 2
+        elif body[i + 1:i + 4].isdigit():
+            raw.append(int(body[i + 1:i + 4], 8) & 0xFF)
+            i += 4
+        else:
+            raw += body[i + 1].encode('utf-8')
+            i += 2
+    return raw.decode('utf-8', errors='replace')
+
+
+def _strip_prefix(path: str) -> str:
+    """Remove the a/ or b/ prefix git adds to diff paths."""
+    path = _unquote_path(path)
+    return path[2:] if path.startswith(('a/', 'b/')) else path
+
+
+def _header_path(header: str) -> str:
+    """Get the new path from a diff --git header, quoted or not."""
+    paths = header[len(_DIFF_HEADER_PREFIX):]
+    if paths.endswith('"'):
+        # Quoted paths escape '"', so ' "' only occurs before the new path
+        return _strip_prefix(paths[paths.rfind(' "') + 1:])
+    match = _UNQUOTED_PATHS.match(paths)
+    if match:
+        return match.group(2)
+    return _strip_prefix(paths.rsplit(' ', 1)[-1])
+
+
+def parse_diff(diff_content: str) -> List[FileDiff]:
+    """
+    Split a unified git diff into per-file sections.
+
+    Args:
+        diff_content: Output of git diff
+
+    Returns:
+        List of parsed file diffs, in diff order. Offsets are character
+        positions in diff_content.
+    """
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    current_lines: List[str] = []
+    position = 0
+    # ---/+++ are file headers only before the first hunk of a file
+    in_hunk = False
+
+    def finish() -> None:
+        if current is not None:
+            current.text = '\n'.join(current_lines)
+            files.append(current)
+
+    for line in diff_content.split('\n'):
+        line_start = position
+        position += len(line) + 1
+
+        if line.startswith(_DIFF_HEADER_PREFIX):
+            finish()
+            current = FileDiff(path=_header_path(line), offset=line_start)
+            current_lines = [line]
+            in_hunk = False
+            continue
+
+        if current is None:
+            continue
+        current_lines.append(line)
+
+        if line.startswith('@@'):
+            in_hunk = True
+            hunk = _HUNK_HEADER.match(line)
+            current.hunk_offsets.append(line_start)
+            current.hunk_headers.append(hunk.group(1).strip() if hunk else "")
+        elif in_hunk:
+            if line.startswith('+'):
+                current.additions += 1
+                current.added_lines.append(line[1:])
+            elif line.startswith('-'):
+                current.deletions += 1
+                current.removed_lines.append(line[1:])
+        elif _INDEX_LINE.match(line):
+            index = _INDEX_LINE.match(line)
+            current.old_blob, current.new_blob = index.group(1), index.group(2)
+        elif line.startswith('new file mode'):
+            current.status = "A"
+        elif line.startswith('deleted file mode'):
+            current.status = "D"
+        elif line.startswith('+++ ') and line != '+++ /dev/null':
+            current.path = _strip_prefix(line[len('+++ '):])
+        elif line.startswith('rename from '):
+            current.status = "R"
+            current.old_path = _unquote_path(line[len('rename from '):])
+        elif line.startswith('rename to '):
+            current.path = _unquote_path(line[len('rename to '):])
+        elif line.startswith('Binary files ') or line == 'GIT binary patch':
+            current.binary = True
+
+    finish()
+    return files
+
+
+def _language_for(path: str) -> Optional[str]:
+    """Guess the language of a file from its name."""
+    name = PurePosixPath(path).name
+    if name.startswith('.env'):
+        return "toml"
+    return _LANGUAGE_BY_SUFFIX.get(PurePosixPath(path).suffix.lower())
+
+
+def _match_code_symbol(line: str, language: str) -> Optional[Tuple[str, str]]:
+    """Match a line against the definition patterns of a language."""
+    for pattern in _CODE_PATTERNS[language]:
+        match = pattern.match(line)
+        if not match:
+            continue
+        if match.lastindex == 1:
+            # Bare function signature (C family): no keyword captured
+            name = match.group(1)
+            if name in _C_KEYWORDS:
+                continue
+            return "fn", name
+        return match.group(1), match.group(2)
+    return None
+
+
+def _match_config_key(line: str, language: str) -> Optional[str]:
+    """Match a line against the key patterns of a config format."""
+    if language == "yaml":
+        match = _YAML_PATTERNS[0].match(line)
+        # Only report top-level and first-level keys to keep the index compact
+        if match and len(match.group(1)) <= 2:
+            return match.group(2)
+        return None
+    patterns = _TOML_PATTERNS if language == "toml" else _JSON_PATTERNS
+    for pattern in patterns:
+        match = pattern.match(line)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def extract_symbols(file_diff: FileDiff) -> List[str]:
+    """
+    Extract the functions, classes and config keys touched by a file diff.
+
+    Definitions found on added or removed lines are listed first, followed
+    by the enclosing symbols named in hunk headers.
+
+    Args:
+        file_diff: Parsed file diff
+
+    Returns:
+        Ordered, de-duplicated list of symbol labels such as "def main"
+    """
+    language = _language_for(file_diff.path)
+    if language is None or file_diff.binary:
+        return []
+
+    symbols: List[str] = []
+    seen = set()
+
+    def add(label: str) -> None:
+        if label not in seen:
+            seen.add(label)
+            symbols.append(label)
+
+    if language in _CODE_PATTERNS:
+        for line in file_diff.added_lines + file_diff.removed_lines:
+            match = _match_code_symbol(line, language)
+            if match:
+                add(f"{match[0]} {match[1]}")
+        for context in file_diff.hunk_headers:
+            match = _match_code_symbol(context, language) if context else None
+            if match:
+                add(f"{match[0]} {match[1]}")
+    else:
+        for line in file_diff.added_lines + file_diff.removed_lines:
+            key = _match_config_key(line, language)
+            if key:
+                add(f"key {key}")
+
+    return symbols
+
+
+def _excerpt_lines(file_diff: FileDiff) -> List[str]:
+    """Pick a few non-blank changed lines that show what a file change does."""
+    def pick(lines: List[str], marker: str, limit: int) -> List[str]:
+        picked = []
+        for line in lines:
+            if len(picked) == limit:
+                break
+            text = line.strip()
+            if text:
+                picked.append(f"{_EXCERPT_INDENT}{marker} {text[:MAX_EXCERPT_LINE_LENGTH]}")
+        return picked
+
+    removed = pick(file_diff.removed_lines, "-", MAX_EXCERPT_LINES_PER_FILE // 2)
+    added = pick(file_diff.added_lines, "+", MAX_EXCERPT_LINES_PER_FILE - len(removed))
+    return removed + added
+
+
+def _format_file_entry(file_diff: FileDiff, symbols: List[str]) -> str:
+    """Format the lines of the change index for a single file."""
+    if file_diff.status == "R" and file_diff.old_path:
+        entry = f"R {file_diff.old_path} -> {file_diff.path}"
+    else:
+        entry = f"{file_diff.status} {file_diff.path}"
+
+    if file_diff.binary:
+        return f"{entry} (binary)"
+
+    entry += f" (+{file_diff.additions} -{file_diff.deletions})"
+    if symbols:
+        shown = symbols[:MAX_SYMBOLS_PER_FILE]
+        entry += ": " + ", ".join(shown)
+        if len(symbols) > len(shown):
+            entry += f", ... {len(symbols) - len(shown)} more"
+    return '\n'.join([entry] + _excerpt_lines(file_diff))
+
+
+def build_change_index(files: List[FileDiff]) -> str:
+    """
+    Build a compact index of changed files and symbols, with a few excerpts
+    of the changed lines under each file.
+
+    Args:
+        files: Parsed file diffs
+
+    Returns:
+        Change index text
+    """
+    return '\n'.join(_format_file_entry(f, extract_symbols(f)) for f in files)
+
+
+def index_covers_changes(files: List[FileDiff]) -> bool:
+    """
+    Check whether the change index describes every file well enough that
+    per-chunk summaries can be skipped.
+
+    Args:
+        files: Parsed file diffs
+
+    Returns:
+        True if every text file's changes are fully quoted in its excerpts,
+        or small relative to the number of symbols extracted from it
+    """
+    if not files:
+        return False
+    for file_diff in files:
+        changed = file_diff.additions + file_diff.deletions
+        if file_diff.binary or changed <= MAX_EXCERPT_LINES_PER_FILE:
+            continue
+        if changed > MAX_COVERED_LINES_PER_SYMBOL * len(extract_symbols(file_diff)):
+            return False
+    return True
+
+
+def truncate_change_index(change_index: str, max_size: int) -> str:
+    """
+    Shrink a change index to fit a size budget.
+
+    Excerpts are dropped first, then symbol lists, then whole file lines.
+
+    Args:
+        change_index: Change index from build_change_index
+        max_size: Maximum size in characters
+
+    Returns:
+        Change index no longer than max_size
+    """
+    if len(change_index) <= max_size:
+        return change_index
+
+    entries = [line for line in change_index.split('\n') if not line.startswith(_EXCERPT_INDENT)]
+    if len('\n'.join(entries)) <= max_size:
+        return '\n'.join(entries)
+
+    entries = [_ENTRY_STATS.sub(r"\1", line) for line in entries]
+    kept: List[str] = []
+    size = 0
+    for i, line in enumerate(entries):
+        remaining = len(entries) - i
+        # Leave room for the "... N more files" line unless this is the last entry
+        reserve = len(f"\n... {remaining - 1} more files") if remaining > 1 else 0
+        if size + len(line) + reserve > max_size:
+            kept.append(f"... {remaining} more files")
+            break
+        kept.append(line)
+        size += len(line) + 1
+    return '\n'.join(kept)[:max_size]
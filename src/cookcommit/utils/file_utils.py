@@ -3,7 +3,12 @@ File operations utilities.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 
 
 def save_to_file(content: str, filepath: str) -> bool:
@@ -45,3 +50,25 @@ def read_from_file(filepath: str) -> Optional[str]:
 def file_exists(filepath: str) -> bool:
     """Check if a file exists."""
     return Path(filepath).exists()
+
+
+def load_toml_file(filepath: str) -> Dict[str, Any]:
+    """
+    Load a TOML file.
+
+    Args:
+        filepath: Path to read from
+
+    Returns:
+        Parsed content, or an empty dict if the file does not exist
+
+    Raises:
+        ValueError: If the file is not valid TOML
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        return {}
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"Invalid {filepath}: {e}")
@@ -0,0 +1,95 @@
+"""
+Monorepo scope partitioning utilities.
+
+Scope rules are read from the ``[scopes]`` table of the repository config
+file, mapping path patterns to conventional commit scopes::
+
+    [scopes]
+    "packages/api/" = "api"
+    "packages/web/*" = "web"
+    "docs/" = "docs"
+
+Patterns ending in ``/`` match a directory prefix, other patterns are
+shell-style globs. The first matching rule wins.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Tuple
+
+from ..config import REPO_CONFIG_FILE
+from .diff_utils import FileDiff
+from .file_utils import load_toml_file
+
+ScopeRules = List[Tuple[str, str]]
+
+
+def load_scope_rules(filepath: str = REPO_CONFIG_FILE) -> ScopeRules:
+    """
+    Load path-to-scope rules from a config file.
+
+    Args:
+        filepath: Path to the TOML config file
+
+    Returns:
+        List of (pattern, scope) rules in file order, empty if none configured
+
+    Raises:
+        ValueError: If the file is not valid TOML or the rules are malformed
+    """
+    data = load_toml_file(filepath)
+    scopes = data.get("scopes", {})
+    if not isinstance(scopes, dict):
+        raise ValueError(f"Invalid {filepath}: [scopes] must be a table")
+
+    rules = []
+    for pattern, scope in scopes.items():
+        if not isinstance(scope, str) or not scope:
+            raise ValueError(f"Invalid {filepath}: scope for '{pattern}' must be a non-empty string")
+        rules.append((pattern, scope))
+    return rules
+
+
+def resolve_scope(path: str, rules: ScopeRules) -> Optional[str]:
+    """
+    Find the scope a file path belongs to.
+
+    Args:
+        path: Repository-relative file path
+        rules: Path-to-scope rules
+
+    Returns:
+        Matching scope or None if no rule matches
+    """
+    for pattern, scope in rules:
+        if pattern.endswith('/'):
+            if path.startswith(pattern):
+                return scope
+        elif fnmatchcase(path, pattern):
+            return scope
+    return None
+
+
+def partition_diff(files: List[FileDiff], rules: ScopeRules) -> Dict[Optional[str], List[FileDiff]]:
+    """
+    Group file diffs by scope.
+
+    Renamed files are assigned by their new path. Files that match no rule
+    are grouped under None.
+
+    Args:
+        files: Parsed file diffs
+        rules: Path-to-scope rules
+
+    Returns:
+        Mapping of scope to its file diffs, in order of first appearance
+    """
+    partitions: Dict[Optional[str], List[FileDiff]] = {}
+    for file_diff in files:
+        scope = resolve_scope(file_diff.path, rules)
+        partitions.setdefault(scope, []).append(file_diff)
+    return partitions
+
+
+def join_file_diffs(files: List[FileDiff]) -> str:
+    """Reassemble file diffs into a single diff text."""
+    return '\n'.join(f.text for f in files)
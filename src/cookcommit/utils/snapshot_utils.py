@@ -0,0 +1,305 @@
+"""
+Diff snapshot utilities.
+
+A snapshot stores a staged diff together with everything the generation
+pipeline derives from it, so messages can be regenerated elsewhere without
+git or re-chunking. Layout::
+
+    MAGIC | header length (uint32, little endian) | JSON header | chunk blocks
+
+The header holds the file table (paths, status, blob hashes, file and hunk
+offsets), the change index and one entry per chunk. File, hunk and chunk
+start/end offsets are character positions in the decoded diff, so a file
+maps directly to the chunks holding it. Each chunk is gzip compressed on its
+own, so readers decompress only the chunks they use.
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional
+
+from ..settings import get_settings
+from .diff_utils import FileDiff, parse_diff, build_change_index, index_covers_changes
+from .text_utils import chunk_text
+
+SNAPSHOT_MAGIC = b"CCSNAP\x00\x01"
+SNAPSHOT_VERSION = 1
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+_FILE_FIELDS = (
+    "path", "old_path", "status", "binary", "additions", "deletions",
+    "old_blob", "new_blob", "offset", "hunk_offsets",
+)
+
+# Required header keys and their types
+_HEADER_FIELDS = {
+    "version": int, "codec": str, "diff_length": int,
+    "change_index": str, "index_covers": bool, "files": list, "chunks": list,
+}
+_FILE_ENTRY_FIELDS = (*_FILE_FIELDS, "length")
+_FILE_INT_FIELDS = ("offset", "length", "additions", "deletions")
+_CHUNK_ENTRY_FIELDS = ("offset", "size", "raw_size", "sha256", "start", "end")
+_CHUNK_INT_FIELDS = ("offset", "size", "start", "end")
+
+
+def _is_int(value: Any) -> bool:
+    """Check for a JSON integer (bool is a subclass of int)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def write_snapshot(diff_content: str, filepath: str, max_chunk_size: Optional[int] = None) -> bool:
+    """
+    Write a diff snapshot to a file.
+
+    Args:
+        diff_content: Git diff content
+        filepath: Path to save snapshot
+        max_chunk_size: Maximum size per chunk, defaults to the max_chunk_size setting
+
+    Returns:
+        True if successful, False otherwise
+    """
+    if max_chunk_size is None:
+        max_chunk_size = get_settings().max_chunk_size
+
+    files = parse_diff(diff_content)
+    chunks = chunk_text(diff_content, max_chunk_size)
+
+    blocks = []
+    chunk_table = []
+    data_offset = 0
+    text_offset = 0
+    for chunk in chunks:
+        raw = chunk.encode('utf-8')
+        block = gzip.compress(raw, mtime=0)
+        chunk_table.append({
+            "offset": data_offset,
+            "size": len(block),
+            "raw_size": len(raw),
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "start": text_offset,
+            "end": text_offset + len(chunk),
+        })
+        blocks.append(block)
+        data_offset += len(block)
+        # Chunks are joined with a newline that belongs to neither of them
+        text_offset += len(chunk) + 1
+
+    file_table = []
+    for file_diff in files:
+        entry = {name: getattr(file_diff, name) for name in _FILE_FIELDS}
+        entry["length"] = len(file_diff.text)
+        file_table.append(entry)
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": int(time.time()),
+        "codec": "gzip",
+        "chunk_size": max_chunk_size,
+        "diff_length": len(diff_content),
+        "diff_sha256": hashlib.sha256(diff_content.encode('utf-8')).hexdigest(),
+        "change_index": build_change_index(files),
+        "index_covers": index_covers_changes(files),
+        "files": file_table,
+        "chunks": chunk_table,
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+
+    try:
+        with open(filepath, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            for block in blocks:
+                f.write(block)
+        return True
+    except Exception:
+        return False
+
+
+class DiffSnapshot:
+    """Read-only, memory-mapped view of a diff snapshot."""
+
+    def __init__(self, filepath: str):
+        """
+        Open a snapshot file.
+
+        Args:
+            filepath: Path to snapshot file
+
+        Raises:
+            ValueError: If the file cannot be read or is not a valid snapshot
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read snapshot {filepath}: {e}")
+
+        try:
+            self._header = self._read_header()
+        except ValueError as e:
+            self._map.close()
+            raise ValueError(f"Invalid snapshot {filepath}: {e}")
+
+        self._data_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size + self._header_length
+        self._chunks: Dict[int, str] = {}
+        self._chunk_starts = [entry["start"] for entry in self._header["chunks"]]
+        self._file_lengths = {entry["offset"]: entry["length"] for entry in self._header["files"]}
+
+        data_size = len(self._map) - self._data_start
+        for entry in self._header["chunks"]:
+            if entry["offset"] < 0 or entry["offset"] + entry["size"] > data_size:
+                self._map.close()
+                raise ValueError(f"Invalid snapshot {filepath}: chunk data past end of file")
+
+    def _read_header(self) -> Dict[str, Any]:
+        """Parse and validate the snapshot header."""
+        prefix_size = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+        if len(self._map) < prefix_size or self._map[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError("not a cookcommit snapshot")
+
+        (self._header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(SNAPSHOT_MAGIC))
+        if prefix_size + self._header_length > len(self._map):
+            raise ValueError("header past end of file")
+        try:
+            header = json.loads(self._map[prefix_size:prefix_size + self._header_length])
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError("corrupt header")
+
+        if not isinstance(header, dict):
+            raise ValueError("corrupt header")
+        for key, kind in _HEADER_FIELDS.items():
+            if not isinstance(header.get(key), kind):
+                raise ValueError(f"missing or invalid header field '{key}'")
+        if header["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported version {header['version']}")
+        if header["codec"] != "gzip":
+            raise ValueError(f"unsupported codec {header['codec']}")
+
+        for entry in header["files"]:
+            if not isinstance(entry, dict) or any(key not in entry for key in _FILE_ENTRY_FIELDS):
+                raise ValueError("corrupt file table")
+            if not all(_is_int(entry[key]) for key in _FILE_INT_FIELDS):
+                raise ValueError("corrupt file table")
+            if not isinstance(entry["path"], str) or not isinstance(entry["hunk_offsets"], list):
+                raise ValueError("corrupt file table")
+            if not all(_is_int(offset) for offset in entry["hunk_offsets"]):
+                raise ValueError("corrupt file table")
+
+        previous_start = 0
+        for entry in header["chunks"]:
+            if not isinstance(entry, dict) or any(key not in entry for key in _CHUNK_ENTRY_FIELDS):
+                raise ValueError("corrupt chunk table")
+            if not all(_is_int(entry[key]) for key in _CHUNK_INT_FIELDS):
+                raise ValueError("corrupt chunk table")
+            # read_range bisects on chunk starts
+            if entry["start"] < previous_start:
+                raise ValueError("chunk starts out of order")
+            previous_start = entry["start"]
+        return header
+
+    def __enter__(self) -> "DiffSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._map.close()
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of pre-computed diff chunks."""
+        return len(self._header["chunks"])
+
+    @property
+    def change_index(self) -> str:
+        """Pre-computed symbol-level change index."""
+        return self._header["change_index"]
+
+    @property
+    def index_covers(self) -> bool:
+        """Whether the change index covers every changed file."""
+        return self._header["index_covers"]
+
+    @property
+    def files(self) -> List[FileDiff]:
+        """File table as file diffs without line content."""
+        return [
+            FileDiff(**{name: entry[name] for name in _FILE_FIELDS})
+            for entry in self._header["files"]
+        ]
+
+    def read_chunk(self, index: int) -> str:
+        """
+        Decompress a single chunk.
+
+        Args:
+            index: Chunk number
+
+        Returns:
+            Chunk text
+
+        Raises:
+            ValueError: If the chunk data is corrupt
+        """
+        if index not in self._chunks:
+            entry = self._header["chunks"][index]
+            start = self._data_start + entry["offset"]
+            try:
+                raw = gzip.decompress(self._map[start:start + entry["size"]])
+            except (OSError, EOFError, zlib.error):
+                raise ValueError(f"Corrupt snapshot chunk {index}")
+            if hashlib.sha256(raw).hexdigest() != entry["sha256"]:
+                raise ValueError(f"Corrupt snapshot chunk {index}")
+            self._chunks[index] = raw.decode('utf-8')
+        return self._chunks[index]
+
+    def read_range(self, start: int, end: int) -> str:
+        """
+        Read part of the diff, decompressing only the chunks that overlap it.
+
+        Args:
+            start: Start character offset in the diff
+            end: End character offset in the diff (exclusive)
+
+        Returns:
+            Diff text between start and end
+        """
+        if end <= start:
+            return ""
+        first = max(bisect_right(self._chunk_starts, start) - 1, 0)
+        last = max(bisect_right(self._chunk_starts, end - 1) - 1, 0)
+
+        chunk_start = self._header["chunks"][first]["start"]
+        text = '\n'.join(self.read_chunk(i) for i in range(first, last + 1))
+        return text[start - chunk_start:end - chunk_start]
+
+    def read_file(self, file_diff: FileDiff) -> str:
+        """
+        Read the diff section of a single file from the file table.
+
+        Args:
+            file_diff: Entry of the files property
+
+        Returns:
+            Diff text of the file
+        """
+        return self.read_range(file_diff.offset, file_diff.offset + self._file_lengths[file_diff.offset])
+
+    def read_chunks(self) -> List[str]:
+        """Decompress all chunks."""
+        return [self.read_chunk(i) for i in range(self.chunk_count)]
+
+    def read_diff(self) -> str:
+        """Reassemble the full diff text."""
+        return '\n'.join(self.read_chunks())
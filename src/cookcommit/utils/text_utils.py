@@ -2,21 +2,24 @@
 Text processing utilities.
 """
 
-from typing import List
-from ..config import MAX_CHUNK_SIZE
+from typing import List, Optional
+from ..settings import get_settings
 
 
-def chunk_text(text: str, max_chunk_size: int = MAX_CHUNK_SIZE) -> List[str]:
+def chunk_text(text: str, max_chunk_size: Optional[int] = None) -> List[str]:
     """
     Split text into chunks that fit within the model's context window.
 
     Args:
         text: Text to chunk
-        max_chunk_size: Maximum size per chunk
+        max_chunk_size: Maximum size per chunk, defaults to the max_chunk_size setting
 
     Returns:
         List of text chunks
     """
+    if max_chunk_size is None:
+        max_chunk_size = get_settings().max_chunk_size
+
     lines = text.split('\n')
     chunks = []
     current_chunk = []
@@ -0,0 +1,6 @@
+"""Test configuration: make the src layout importable."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
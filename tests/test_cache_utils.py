@@ -0,0 +1,67 @@
+"""Tests for the message cache."""
+
+import os
+import time
+
+import pytest
+
+from cookcommit import settings
+from cookcommit.settings import Settings
+from cookcommit.utils.cache_utils import load_cached, make_cache_key, store_cached
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    (tmp_path / ".git").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _use_settings(monkeypatch, **values):
+    monkeypatch.setattr(settings, "_settings", Settings(**values))
+
+
+def test_make_cache_key_separates_parts():
+    assert make_cache_key("commit", "model", "diff") == make_cache_key("commit", "model", "diff")
+    assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
+    assert make_cache_key("commit", "model-a", "diff") != make_cache_key("commit", "model-b", "diff")
+
+
+def test_store_and_load(repo, monkeypatch):
+    _use_settings(monkeypatch, cache_max_entries=10, cache_ttl=0)
+    assert load_cached("missing") is None
+    assert store_cached("key", "feat: add cache")
+    assert load_cached("key") == "feat: add cache"
+
+
+def test_expired_entries_are_ignored(repo, monkeypatch):
+    _use_settings(monkeypatch, cache_max_entries=10, cache_ttl=60)
+    store_cached("key", "message")
+    path = repo / ".git" / "cookcommit" / "cache" / "key"
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    assert load_cached("key") is None
+
+
+def test_oldest_entries_are_evicted(repo, monkeypatch):
+    _use_settings(monkeypatch, cache_max_entries=2, cache_ttl=0)
+    for i, key in enumerate(["a", "b", "c"]):
+        store_cached(key, key)
+        mtime = time.time() - 100 + i
+        os.utime(repo / ".git" / "cookcommit" / "cache" / key, (mtime, mtime))
+    store_cached("d", "d")
+
+    assert sorted(p.name for p in (repo / ".git" / "cookcommit" / "cache").iterdir()) == ["c", "d"]
+
+
+def test_cache_is_disabled_outside_repositories_and_at_zero_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _use_settings(monkeypatch, cache_max_entries=10)
+    assert not store_cached("key", "message")
+    assert not (tmp_path / ".git").exists()
+
+    (tmp_path / ".git").mkdir()
+    _use_settings(monkeypatch, cache_max_entries=0)
+    assert not store_cached("key", "message")
+    assert load_cached("key") is None
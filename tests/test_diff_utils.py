@@ -0,0 +1,144 @@
+"""Tests for diff parsing and the change index."""
+
+from cookcommit.utils.diff_utils import (
+    build_change_index,
+    extract_symbols,
+    index_covers_changes,
+    parse_diff,
+    truncate_change_index,
+)
+
+
+def _modified(path: str, body: str, context: str = "") -> str:
+    lines = body.split('\n')
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        f"index 1111111..2222222 100644\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -1,{len(lines)} +1,{len(lines)} @@ {context}\n"
+        f"{body}\n"
+    )
+
+
+def _added(path: str, lines: int) -> str:
+    body = '\n'.join(f"+line {i}" for i in range(lines))
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        f"new file mode 100644\n"
+        f"index 0000000..3333333\n"
+        f"--- /dev/null\n"
+        f"+++ b/{path}\n"
+        f"@@ -0,0 +1,{lines} @@\n"
+        f"{body}\n"
+    )
+
+
+def test_parse_diff_counts_and_offsets():
+    diff = _modified("a.py", "-old = 1\n+new = 2\n context") + _added("b.md", 3)
+    files = parse_diff(diff)
+
+    assert [(f.path, f.status, f.additions, f.deletions) for f in files] == [
+        ("a.py", "M", 1, 1),
+        ("b.md", "A", 3, 0),
+    ]
+    assert files[0].old_blob == "1111111" and files[0].new_blob == "2222222"
+    for file_diff in files:
+        assert diff[file_diff.offset:].startswith(file_diff.text)
+        assert diff[file_diff.hunk_offsets[0]:].startswith("@@")
+
+
+def test_parse_diff_counts_dash_and_plus_content_lines():
+    # Removing "-- comment" and adding "++ x" produce ---/+++ lines inside a hunk
+    files = parse_diff(_modified("q.sql", "--- comment\n+++ x\n select 1"))
+
+    assert files[0].path == "q.sql"
+    assert (files[0].additions, files[0].deletions) == (1, 1)
+    assert files[0].removed_lines == ["-- comment"]
+    assert files[0].added_lines == ["++ x"]
+
+
+def test_parse_diff_quoted_paths():
+    diff = (
+        'diff --git "a/caf\\303\\251 \\"menu\\".txt" "b/caf\\303\\251 \\"menu\\".txt"\n'
+        'index 1111111..2222222 100644\n'
+        '--- "a/caf\\303\\251 \\"menu\\".txt"\n'
+        '+++ "b/caf\\303\\251 \\"menu\\".txt"\n'
+        '@@ -1 +1 @@\n'
+        '-a\n'
+        '+b\n'
+    ) + _modified("c.yml", "+key: 1")
+    files = parse_diff(diff)
+
+    assert [f.path for f in files] == ['café "menu".txt', "c.yml"]
+    assert files[1].additions == 1
+
+
+def test_parse_diff_rename_and_binary():
+    diff = (
+        "diff --git a/old name.py b/new name.py\n"
+        "similarity index 100%\n"
+        "rename from old name.py\n"
+        "rename to new name.py\n"
+        "diff --git a/logo.png b/logo.png\n"
+        "index 1111111..2222222 100644\n"
+        "Binary files a/logo.png and b/logo.png differ\n"
+    )
+    renamed, image = parse_diff(diff)
+
+    assert (renamed.status, renamed.old_path, renamed.path) == ("R", "old name.py", "new name.py")
+    assert image.path == "logo.png" and image.binary
+
+
+def test_extract_symbols_from_lines_and_hunk_headers():
+    diff = _modified("app.py", "+def helper():\n+    return 1\n-class Old:", context="def main():")
+    assert extract_symbols(parse_diff(diff)[0]) == ["def helper", "class Old", "def main"]
+
+    config = _modified("deploy.yml", "+services:\n+  web:\n+      image: x")
+    assert extract_symbols(parse_diff(config)[0]) == ["key services", "key web"]
+
+    assert extract_symbols(parse_diff(_added("notes.txt", 2))[0]) == []
+
+
+def test_index_covers_small_and_symbol_dense_changes():
+    small = _modified("README.md", "-old\n+new")
+    dense = _modified("app.py", '\n'.join(f"+def f{i}(): pass" for i in range(30)))
+    assert index_covers_changes(parse_diff(small + dense))
+    assert not index_covers_changes([])
+
+
+def test_index_does_not_cover_large_new_file_without_symbols():
+    assert not index_covers_changes(parse_diff(_added("docs/guide.md", 200)))
+
+
+def test_index_does_not_cover_large_rewrite_inside_one_function():
+    body = '\n'.join(f"-    old_{i}()\n+    new_{i}()" for i in range(250))
+    files = parse_diff(_modified("app.py", body, context="def main():"))
+
+    assert extract_symbols(files[0]) == ["def main"]
+    assert not index_covers_changes(files)
+
+
+def test_build_change_index_lists_symbols_and_excerpts():
+    files = parse_diff(_modified("app.py", "-x = 1\n+def run():", context="class App:"))
+    index = build_change_index(files)
+
+    assert index.split('\n')[0] == "M app.py (+1 -1): def run, class App"
+    assert "    - x = 1" in index and "    + def run():" in index
+
+
+def test_truncate_change_index_drops_excerpts_then_symbols_then_files():
+    diff = ''.join(
+        _modified(f"mod{i}.py", f"-x = {i}\n+def func_{i}():") for i in range(20)
+    )
+    index = build_change_index(parse_diff(diff))
+    assert truncate_change_index(index, len(index)) == index
+
+    no_excerpts = truncate_change_index(index, len(index) - 1)
+    assert "    " not in no_excerpts and "def func_0" in no_excerpts
+
+    no_symbols = truncate_change_index(index, len(no_excerpts) - 1)
+    assert "def func_0" not in no_symbols and "M mod19.py (+1 -1)" in no_symbols
+
+    tiny = truncate_change_index(index, 60)
+    assert len(tiny) <= 60 and tiny.startswith("M mod0.py")
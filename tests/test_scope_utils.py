@@ -0,0 +1,64 @@
+"""Tests for monorepo scope partitioning."""
+
+import pytest
+
+from cookcommit.utils.diff_utils import parse_diff
+from cookcommit.utils.scope_utils import join_file_diffs, load_scope_rules, partition_diff, resolve_scope
+
+RULES = [("packages/api/", "api"), ("packages/web/*", "web"), ("*.md", "docs")]
+
+
+def _file_diff(path: str) -> str:
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        f"index 1111111..2222222 100644\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -1 +1 @@\n"
+        f"-old\n"
+        f"+new\n"
+    )
+
+
+@pytest.mark.parametrize("path, scope", [
+    ("packages/api/server.py", "api"),
+    ("packages/api-client/index.js", None),
+    ("packages/web/src/app.tsx", "web"),
+    ("README.md", "docs"),
+    ("packages/api/README.md", "api"),
+    ("setup.py", None),
+])
+def test_resolve_scope_first_match_wins(path, scope):
+    assert resolve_scope(path, RULES) == scope
+
+
+def test_partition_diff_groups_in_order_and_round_trips():
+    paths = ["packages/web/a.ts", "setup.py", "packages/api/b.py", "packages/web/c.ts"]
+    diff = ''.join(_file_diff(path) for path in paths)
+    partitions = partition_diff(parse_diff(diff), RULES)
+
+    assert list(partitions) == ["web", None, "api"]
+    assert [f.path for f in partitions["web"]] == ["packages/web/a.ts", "packages/web/c.ts"]
+    assert join_file_diffs(partitions["api"]) == _file_diff("packages/api/b.py").rstrip('\n')
+
+
+def test_partition_diff_uses_new_path_of_renames():
+    diff = (
+        "diff --git a/packages/web/util.ts b/packages/api/util.ts\n"
+        "similarity index 100%\n"
+        "rename from packages/web/util.ts\n"
+        "rename to packages/api/util.ts\n"
+    )
+    assert list(partition_diff(parse_diff(diff), RULES)) == ["api"]
+
+
+def test_load_scope_rules(tmp_path):
+    path = tmp_path / ".cookcommit.toml"
+    assert load_scope_rules(str(path)) == []
+
+    path.write_text('max_workers = 2\n[scopes]\n"docs/" = "docs"\n"*.py" = "py"\n')
+    assert load_scope_rules(str(path)) == [("docs/", "docs"), ("*.py", "py")]
+
+    path.write_text('[scopes]\n"docs/" = 1\n')
+    with pytest.raises(ValueError, match="non-empty string"):
+        load_scope_rules(str(path))
@@ -0,0 +1,60 @@
+"""Tests for the layered runtime settings."""
+
+import pytest
+
+from cookcommit.settings import load_settings, parse_overrides
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "xdg"))
+    return tmp_path
+
+
+def test_layers_override_in_order(isolated_config):
+    user_dir = isolated_config / "xdg" / "cookcommit"
+    user_dir.mkdir(parents=True)
+    (user_dir / "config.toml").write_text("max_workers = 2\nrequest_timeout = 30\n")
+    (isolated_config / ".cookcommit.toml").write_text('max_workers = 3\n[scopes]\n"a/" = "a"\n')
+
+    settings = load_settings(
+        parse_overrides(["cache_ttl=0"]),
+        environ={"COOKCOMMIT_REQUEST_TIMEOUT": "10"},
+    )
+
+    assert settings.max_workers == 3
+    assert settings.request_timeout == 10.0
+    assert settings.cache_ttl == 0
+    assert settings.sources["max_workers"] == ".cookcommit.toml"
+    assert settings.sources["cache_ttl"] == "command line"
+
+
+@pytest.mark.parametrize("value", ["inf", "-inf", "nan"])
+def test_rejects_non_finite_numbers(value):
+    with pytest.raises(ValueError, match="finite"):
+        load_settings(environ={"COOKCOMMIT_REQUEST_TIMEOUT": value})
+
+
+@pytest.mark.parametrize("override", ["max_workers=0", "unknown=1", "max_retries=many"])
+def test_rejects_invalid_values(override):
+    with pytest.raises(ValueError):
+        load_settings(parse_overrides([override]), environ={})
+
+
+def test_api_key_has_no_default():
+    assert load_settings(environ={}).api_key is None
+
+
+def test_api_key_environment_priority():
+    environ = {"GEMINI_API_KEY": "gemini", "GOOGLE_API_KEY": "google"}
+    assert load_settings(environ=environ).api_key == "google"
+
+    environ["COOKCOMMIT_API_KEY"] = "cookcommit"
+    assert load_settings(environ=environ).api_key == "cookcommit"
+
+
+def test_api_key_not_allowed_in_repo_config(isolated_config):
+    (isolated_config / ".cookcommit.toml").write_text('api_key = "secret"\n')
+    with pytest.raises(ValueError, match="not allowed"):
+        load_settings(environ={})
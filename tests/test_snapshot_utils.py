@@ -0,0 +1,144 @@
+"""Tests for the diff snapshot format."""
+
+import json
+import struct
+
+import pytest
+
+from cookcommit.utils.diff_utils import parse_diff
+from cookcommit.utils.snapshot_utils import SNAPSHOT_MAGIC, DiffSnapshot, write_snapshot
+
+
+def _file_diff(path: str, lines: int) -> str:
+    body = '\n'.join(f"+line {i} ünïcode {path}" for i in range(lines))
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        f"index 1111111..2222222 100644\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -0,0 +1,{lines} @@ def main():\n"
+        f"{body}\n"
+    )
+
+
+DIFF = _file_diff("a.py", 40) + _file_diff("b/c.py", 40) + _file_diff("d.py", 5)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "diff.ccsnap"
+    assert write_snapshot(DIFF, str(path), max_chunk_size=500)
+    return path
+
+
+def _rewrite_header(path, header):
+    data = path.read_bytes()
+    (length,) = struct.unpack_from("<I", data, len(SNAPSHOT_MAGIC))
+    blocks = data[len(SNAPSHOT_MAGIC) + 4 + length:]
+    header_bytes = json.dumps(header).encode('utf-8')
+    path.write_bytes(SNAPSHOT_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + blocks)
+
+
+def _read_header(path):
+    data = path.read_bytes()
+    (length,) = struct.unpack_from("<I", data, len(SNAPSHOT_MAGIC))
+    return json.loads(data[len(SNAPSHOT_MAGIC) + 4:len(SNAPSHOT_MAGIC) + 4 + length])
+
+
+def test_round_trip(snapshot_path):
+    with DiffSnapshot(str(snapshot_path)) as snapshot:
+        assert snapshot.chunk_count > 2
+        assert snapshot.read_diff() == DIFF
+
+        parsed = parse_diff(DIFF)
+        files = snapshot.files
+        assert [f.path for f in files] == [f.path for f in parsed]
+        assert [f.hunk_offsets for f in files] == [f.hunk_offsets for f in parsed]
+        assert files[0].old_blob == "1111111" and files[0].new_blob == "2222222"
+
+
+def test_read_file_loads_only_overlapping_chunks(snapshot_path):
+    parsed = parse_diff(DIFF)
+    with DiffSnapshot(str(snapshot_path)) as snapshot:
+        last = snapshot.files[-1]
+        assert snapshot.read_file(last) == parsed[-1].text
+        assert len(snapshot._chunks) < snapshot.chunk_count
+
+        for file_diff, expected in zip(snapshot.files, parsed):
+            assert snapshot.read_file(file_diff) == expected.text
+
+
+def test_rejects_non_snapshot(tmp_path):
+    path = tmp_path / "diff.txt"
+    path.write_text(DIFF)
+    with pytest.raises(ValueError):
+        DiffSnapshot(str(path))
+
+
+def test_rejects_empty_file(tmp_path):
+    path = tmp_path / "empty.ccsnap"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        DiffSnapshot(str(path))
+
+
+def test_rejects_header_past_end_of_file(snapshot_path):
+    data = snapshot_path.read_bytes()
+    snapshot_path.write_bytes(SNAPSHOT_MAGIC + struct.pack("<I", len(data)) + data[len(SNAPSHOT_MAGIC) + 4:])
+    with pytest.raises(ValueError, match="past end of file"):
+        DiffSnapshot(str(snapshot_path))
+
+
+@pytest.mark.parametrize("header", [
+    [1, 2, 3],
+    "header",
+])
+def test_rejects_non_object_header(snapshot_path, header):
+    _rewrite_header(snapshot_path, header)
+    with pytest.raises(ValueError, match="corrupt header"):
+        DiffSnapshot(str(snapshot_path))
+
+
+@pytest.mark.parametrize("key", ["chunks", "files", "change_index", "index_covers"])
+def test_rejects_missing_header_field(snapshot_path, key):
+    header = _read_header(snapshot_path)
+    del header[key]
+    _rewrite_header(snapshot_path, header)
+    with pytest.raises(ValueError, match=key):
+        DiffSnapshot(str(snapshot_path))
+
+
+def test_rejects_chunk_past_end_of_file(snapshot_path):
+    header = _read_header(snapshot_path)
+    header["chunks"][-1]["size"] += 100
+    _rewrite_header(snapshot_path, header)
+    with pytest.raises(ValueError, match="past end of file"):
+        DiffSnapshot(str(snapshot_path))
+
+
+@pytest.mark.parametrize("key, value", [
+    ("offset", "12"), ("length", None), ("additions", True), ("path", 7), ("hunk_offsets", ["5"]),
+])
+def test_rejects_invalid_file_entry(snapshot_path, key, value):
+    header = _read_header(snapshot_path)
+    header["files"][0][key] = value
+    _rewrite_header(snapshot_path, header)
+    with pytest.raises(ValueError, match="corrupt file table"):
+        DiffSnapshot(str(snapshot_path))
+
+
+def test_rejects_unordered_chunk_starts(snapshot_path):
+    header = _read_header(snapshot_path)
+    header["chunks"][0], header["chunks"][1] = header["chunks"][1], header["chunks"][0]
+    _rewrite_header(snapshot_path, header)
+    with pytest.raises(ValueError, match="out of order"):
+        DiffSnapshot(str(snapshot_path))
+
+
+def test_detects_corrupt_chunk(snapshot_path):
+    data = bytearray(snapshot_path.read_bytes())
+    data[-20] ^= 0xFF
+    snapshot_path.write_bytes(bytes(data))
+    with DiffSnapshot(str(snapshot_path)) as snapshot:
+        with pytest.raises(ValueError, match="Corrupt snapshot chunk"):
+            snapshot.read_diff()